@@ -0,0 +1,873 @@
+"""
+server.js 부하 테스트용 가짜 클라이언트 스웜
+
+브라우저 탭이나 game.py 창을 여러 개 띄우는 대신, asyncio 가짜 클라이언트 수백~수천 개를
+로컬 서버에 붙여서 틱 예산(1000/30ms)이 몇 명에서 깨지는지 확인한다.
+외부 패키지 없이 표준 라이브러리만 사용 (WebSocket + Engine.IO/Socket.IO v4 최소 구현).
+
+각 클라이언트:
+  1) 닉네임/색상으로 로비 입장 (setPlayerInfo) → 레디 (setReady)
+  2) 게임 시작 후 playerMove 입력을 계속 전송 (AIPlayer 같은 랜덤 이동 또는 스크립트 원운동)
+  3) 관측 클라이언트(observer)만 gameState를 파싱해서 지표 기록
+
+지표 (백분위수):
+  - 입력→스냅샷 지연: playerMove로 보낸 angle이 gameState의 내 플레이어에 처음 반영될 때까지
+  - 스냅샷 크기: gameState 패킷 바이트 수
+  - 틱 지터: gameState 도착 간격 (기준 1000/SERVER_FPS ms)
+  - 로드 제너레이터 루프 지연: 이 값이 크면 서버가 아니라 이 스크립트가 병목이라는 뜻
+  - 입력 전송률: clients x input-hz 목표 대비 실제로 보낸 입력 수
+
+한 프로세스(이벤트 루프 하나)는 60Hz 입력 기준 수백 명 정도에서 포화된다.
+입력 전송률이 목표에 못 미치면 서버가 아니라 이 스크립트의 한계이므로 --procs 로 나눠서 돌린다.
+
+사용 예:
+  python loadtest.py --spawn-server --clients 200 --duration 30
+  python loadtest.py --clients 1000 --ramp 100 --behavior scripted --procs 8
+"""
+
+import argparse
+import asyncio
+import base64
+import collections
+import json
+import math
+import multiprocessing
+import os
+import queue
+import random
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# ---------------------------------
+# 서버 설정 (server.js 와 맞춰야 함)
+# ---------------------------------
+SERVER_FPS = 30
+TICK_MS = 1000.0 / SERVER_FPS
+SERVER_DIR = os.path.dirname(os.path.abspath(__file__))
+
+JSON_DECODER = json.JSONDecoder()
+
+COLORS = ["#00AAFF", "#FF0000", "#00FF00", "#FFA500", "#800080"]
+
+# 입력마다 angle 에 seq * ANGLE_EPSILON 을 더해서 스냅샷에서 어느 입력이 반영됐는지 구분
+# (π 근처 float 간격 ~4e-16 보다 훨씬 크고, 몇 시간을 돌려도 1e-6 rad 수준)
+ANGLE_EPSILON = 1e-12
+PENDING_MAX = 1024  # 관측 클라이언트당 반영 대기 입력 수 (60Hz 기준 약 17초)
+
+# WebSocket opcode
+WS_CONT = 0x0
+WS_TEXT = 0x1
+WS_BINARY = 0x2
+WS_CLOSE = 0x8
+WS_PING = 0x9
+WS_PONG = 0xA
+
+
+# ---------------------------------
+# 최소 WebSocket 클라이언트 (RFC 6455)
+#   받은 메시지는 on_message(bytes) 로 넘긴다.
+#   wants(앞부분) 이 False 인 메시지는 버퍼에 모으지 않고 도착하는 대로 버린다.
+#   (gameState/lobbyUpdate 는 접속자 수에 비례해서 커지고, 모든 클라이언트에게 매번 오기 때문)
+# ---------------------------------
+class WebSocket(asyncio.Protocol):
+    PEEK = 32  # 메시지 분류에 쓰는 앞부분 길이
+
+    def __init__(self, on_message, wants):
+        loop = asyncio.get_running_loop()
+        self.on_message = on_message
+        self.wants = wants
+        self.transport = None
+        self.buf = bytearray()
+        self.skip = 0       # 버려야 할 남은 바이트 수
+        self.frag = None    # 조각난 메시지: None(없음) / bytearray(모으는 중) / False(버리는 중)
+        self.upgraded = loop.create_future()
+        self.closed = loop.create_future()
+
+    async def open(self, host, port, path):
+        await asyncio.get_running_loop().create_connection(lambda: self, host, port)
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (
+            f"GET {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Key: {key}\r\n"
+            "Sec-WebSocket-Version: 13\r\n"
+            "\r\n"
+        )
+        self.transport.write(request.encode())
+        await self.upgraded
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def connection_lost(self, exc):
+        if not self.upgraded.done():
+            self.upgraded.set_exception(ConnectionError("핸드셰이크 중 연결 끊김"))
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+    def data_received(self, data):
+        if self.skip:
+            if len(data) <= self.skip:
+                self.skip -= len(data)
+                return
+            data = data[self.skip:]
+            self.skip = 0
+        self.buf += data
+
+        if not self.upgraded.done():
+            end = self.buf.find(b"\r\n\r\n")
+            if end < 0:
+                return
+            status = bytes(self.buf[:self.buf.find(b"\r\n")])
+            if b" 101 " not in status + b" ":
+                self.upgraded.set_exception(
+                    ConnectionError(f"WebSocket 핸드셰이크 실패: {status.decode(errors='replace')}"))
+                self.transport.close()
+                return
+            del self.buf[:end + 4]
+            self.upgraded.set_result(None)
+
+        self._parse_frames()
+
+    def _parse_frames(self):
+        buf = self.buf
+        pos = 0
+        while True:
+            avail = len(buf) - pos
+            if avail < 2:
+                break
+            fin = buf[pos] & 0x80
+            opcode = buf[pos] & 0x0F
+            length = buf[pos + 1] & 0x7F
+            hlen = 2
+            if length == 126:
+                hlen = 4
+                if avail < hlen:
+                    break
+                length = struct.unpack_from("!H", buf, pos + 2)[0]
+            elif length == 127:
+                hlen = 10
+                if avail < hlen:
+                    break
+                length = struct.unpack_from("!Q", buf, pos + 2)[0]
+            if buf[pos + 1] & 0x80:
+                # 서버 → 클라이언트 프레임은 마스킹하면 안 됨
+                self.transport.close()
+                return
+            start = pos + hlen
+            body = avail - hlen
+
+            if opcode >= WS_CLOSE:  # 제어 프레임은 항상 작음
+                if body < length:
+                    break
+                payload = bytes(buf[start:start + length])
+                pos = start + length
+                if opcode == WS_PING:
+                    self._send_frame(WS_PONG, payload)
+                elif opcode == WS_CLOSE:
+                    self.close()
+                    return
+                continue
+
+            if opcode == WS_CONT:
+                keep = isinstance(self.frag, bytearray)
+            else:
+                if body < min(length, self.PEEK):
+                    break
+                keep = self.wants(bytes(buf[start:start + min(length, self.PEEK)]))
+
+            if not keep:
+                if opcode != WS_CONT:
+                    self.frag = None if fin else False
+                elif fin:
+                    self.frag = None
+                if body < length:
+                    self.skip = length - body
+                    pos = len(buf)
+                    break
+                pos = start + length
+                continue
+
+            if body < length:
+                break
+            payload = bytes(buf[start:start + length])
+            pos = start + length
+            if opcode == WS_CONT:
+                self.frag += payload
+                if fin:
+                    payload = bytes(self.frag)
+                    self.frag = None
+                    self.on_message(payload)
+            elif fin:
+                self.on_message(payload)
+            else:
+                self.frag = bytearray(payload)
+        del buf[:pos]
+
+    def send_text(self, text):
+        self._send_frame(WS_TEXT, text.encode())
+
+    def _send_frame(self, opcode, payload):
+        if self.transport is None or self.transport.is_closing():
+            return
+        # 클라이언트 → 서버 프레임은 반드시 마스킹
+        n = len(payload)
+        header = bytes([0x80 | opcode])
+        if n < 126:
+            header += bytes([0x80 | n])
+        elif n < 65536:
+            header += bytes([0x80 | 126]) + struct.pack("!H", n)
+        else:
+            header += bytes([0x80 | 127]) + struct.pack("!Q", n)
+        mask = os.urandom(4)
+        if n:
+            key = (mask * (n // 4 + 1))[:n]
+            payload = (int.from_bytes(payload, "big") ^ int.from_bytes(key, "big")).to_bytes(n, "big")
+        self.transport.write(header + mask + payload)
+
+    def close(self):
+        self._send_frame(WS_CLOSE, b"")
+        if self.transport is not None:
+            self.transport.close()
+
+
+# ---------------------------------
+# 입력 행동 (game.py 의 AIPlayer 흉내 / 스크립트)
+# ---------------------------------
+class AIBrain:
+    """AIPlayer 처럼 가끔 랜덤하게 방향을 틀면서 계속 전진"""
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.vx = rng.uniform(-5, 5)
+        self.vy = rng.uniform(-5, 5)
+
+    def next_input(self, t):
+        if self.rng.random() < 0.02:
+            self.vx += self.rng.uniform(-3, 3)
+            self.vy += self.rng.uniform(-3, 3)
+        angle = math.atan2(self.vy, self.vx)
+        return angle, self.rng.random() < 0.9
+
+
+class ScriptedBrain:
+    """일정한 속도로 원을 그리며 이동 (재현 가능한 부하)"""
+
+    def __init__(self, rng):
+        self.phase = rng.uniform(0, 2 * math.pi)
+
+    def next_input(self, t):
+        return self.phase + t * 0.5, True
+
+
+BRAINS = {"ai": AIBrain, "scripted": ScriptedBrain}
+
+
+# ---------------------------------
+# 측정값 기록
+# ---------------------------------
+class Recorder:
+    def __init__(self):
+        self.connect_ms = []
+        self.latency_ms = []
+        self.latency_lower_ms = []  # 끝내 반영 확인 못 한 입력의 하한 (포기 시점까지 걸린 시간)
+        self.latency_evicted = 0    # 대기 버퍼가 넘쳐서 포기
+        self.latency_unmatched = 0  # 측정 후 drain 시간까지 반영 안 됨
+        self.latency_abandoned = 0  # 사망/라운드 종료로 서버가 버린 입력
+        self.snapshot_bytes = []
+        self.tick_interval_ms = []
+        self.loop_lag_ms = []
+        self.inputs_sent = 0
+        self.connected = 0
+        self.connect_failed = 0
+        self.disconnected = 0
+        self.rounds = 0
+        self.restart_failed = 0  # 라운드가 끝난 뒤 다음 라운드가 시작되지 않은 횟수
+        self.measured_s = 0.0  # 실제 측정 구간 길이
+        self.input_rate = 0.0  # 측정 구간 동안 보낸 입력/초
+
+    def merge(self, other):
+        # 다른 프로세스(--procs)의 기록 합치기. other 는 vars(Recorder)
+        for key, value in other.items():
+            if isinstance(value, list):
+                getattr(self, key).extend(value)
+            elif key == "measured_s":
+                self.measured_s = max(self.measured_s, value)
+            else:
+                setattr(self, key, getattr(self, key) + value)
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return float("nan")
+    idx = min(len(sorted_values) - 1, max(0, math.ceil(pct / 100.0 * len(sorted_values)) - 1))
+    return sorted_values[idx]
+
+
+def summarize(name, values, unit):
+    values = sorted(values)
+    if not values:
+        return f"{name:<22} (샘플 없음)"
+    cols = "  ".join(f"p{p:g}={percentile(values, p):.1f}" for p in (50, 90, 99, 99.9))
+    return f"{name:<22} n={len(values):<8} {cols}  max={values[-1]:.1f} {unit}"
+
+
+# ---------------------------------
+# 가짜 클라이언트 (Engine.IO v4 / Socket.IO v4)
+# ---------------------------------
+class FakeClient:
+    def __init__(self, index, swarm, observer):
+        self.index = index
+        self.swarm = swarm
+        self.observer = observer
+        self.rng = random.Random(swarm.args.seed * 100003 + index)
+        self.brain = BRAINS[swarm.args.behavior](self.rng)
+        self.nickname = f"bot{index:04d}"
+        self.color = COLORS[index % len(COLORS)]
+        self.ws = None
+        self.sid = None
+        self.alive = True
+        self.pending = collections.deque()  # (angle, 전송 시각), 보낸 순서대로
+        self.seq = 0
+        self.last_tick = None
+
+    def emit(self, event, data=None):
+        packet = [event] if data is None else [event, data]
+        self.ws.send_text("42" + json.dumps(packet, separators=(",", ":")))
+
+    async def run(self):
+        args = self.swarm.args
+        rec = self.swarm.recorder
+        self.joined = asyncio.get_running_loop().create_future()
+        t0 = time.perf_counter()
+        try:
+            self.ws = WebSocket(self.on_message, self.wants)
+            await self.ws.open(args.host, args.port, "/socket.io/?EIO=4&transport=websocket")
+            await asyncio.wait_for(asyncio.shield(self.joined), args.join_timeout)
+        except (OSError, ConnectionError, asyncio.TimeoutError) as e:
+            rec.connect_failed += 1
+            if rec.connect_failed <= 5:
+                print(f"[{self.nickname}] 접속 실패: {e!r}", file=sys.stderr)
+            if self.ws:
+                self.ws.close()
+            self.swarm.check_all_ready()
+            return
+        rec.connected += 1
+        rec.connect_ms.append((time.perf_counter() - t0) * 1000.0)
+
+        self.emit("setPlayerInfo", {"nickname": self.nickname, "color": self.color})
+        self.emit("setReady", True)
+        self.swarm.client_ready(self)
+
+        sender = asyncio.ensure_future(self.send_inputs())
+        try:
+            await self.ws.closed
+            if not self.swarm.stopping:
+                rec.disconnected += 1
+        finally:
+            sender.cancel()
+            self.ws.close()
+
+    def wants(self, prefix):
+        # 이벤트 이름만 보고 분류 (lobbyUpdate 는 N명에게 N번 오고, 크기도 N에 비례)
+        if prefix.startswith(b'42["gameState"'):
+            return self.observer
+        return not prefix.startswith(b'42["lobbyUpdate"')
+
+    def on_message(self, msg):
+        if msg == b"2":  # Engine.IO ping → pong
+            self.ws.send_text("3")
+        elif msg.startswith(b'42["gameState"'):
+            self.on_game_state(msg)
+        elif msg.startswith(b'42["gameStart"'):
+            self.alive = True
+            self.abandon_pending()
+            self.last_tick = None
+            self.swarm.on_game_start(self)
+        elif msg.startswith(b'42["gameOver"'):
+            self.abandon_pending()
+            self.last_tick = None
+            self.emit("setReady", True)
+            self.swarm.on_game_over(self)
+        elif msg.startswith(b"40"):  # Socket.IO 연결 완료
+            if not self.joined.done():
+                self.sid = json.loads(msg[2:])["sid"]
+                self.joined.set_result(None)
+        elif msg.startswith(b"44"):
+            if not self.joined.done():
+                self.joined.set_exception(
+                    ConnectionError(f"Socket.IO 연결 거부: {msg[2:].decode(errors='replace')}"))
+        elif msg.startswith(b"0"):  # Engine.IO open → Socket.IO 연결 요청
+            self.ws.send_text("40")
+
+    def on_game_state(self, msg):
+        now = time.perf_counter()
+        rec = self.swarm.recorder
+        if self.swarm.measuring:
+            rec.snapshot_bytes.append(len(msg))
+            if self.last_tick is not None:
+                rec.tick_interval_ms.append((now - self.last_tick) * 1000.0)
+        self.last_tick = now
+
+        # 스냅샷 전체를 파싱하지 않고 내 플레이어 객체만 디코드
+        text = msg.decode()
+        key = f'"{self.sid}":{{'
+        idx = text.find(key)
+        if idx < 0:
+            return
+        me, _ = JSON_DECODER.raw_decode(text, idx + len(key) - 1)
+        if not me.get("alive", True):
+            self.alive = False
+            self.abandon_pending()
+            return
+        applied = me.get("angle")
+        for i, (angle, _) in enumerate(self.pending):
+            if angle == applied:
+                break
+        else:
+            return
+        # 서버는 소켓별 입력을 순서대로 처리하므로, 이 입력 이전에 보낸 입력도 모두 반영된 것.
+        # 추적은 게임 시작부터 하지만 기록은 측정 구간에 보낸 입력만
+        for _ in range(i + 1):
+            _, t = self.pending.popleft()
+            if self.swarm.in_window(t):
+                rec.latency_ms.append((now - t) * 1000.0)
+
+    def give_up_pending(self, now, count_attr):
+        # 반영을 끝내 확인하지 못한 측정 구간 입력은 버리지 않고 개수와 하한으로 남긴다
+        rec = self.swarm.recorder
+        _, t = self.pending.popleft()
+        if self.swarm.in_window(t):
+            setattr(rec, count_attr, getattr(rec, count_attr) + 1)
+            rec.latency_lower_ms.append((now - t) * 1000.0)
+
+    def abandon_pending(self):
+        # 죽었거나 라운드가 끝나서 서버가 반영하지 않는 입력 (지연이 아니므로 하한에는 넣지 않음)
+        rec = self.swarm.recorder
+        rec.latency_abandoned += sum(1 for _, t in self.pending if self.swarm.in_window(t))
+        self.pending.clear()
+
+    def has_window_pending(self):
+        return any(self.swarm.in_window(t) for _, t in self.pending)
+
+    async def send_inputs(self):
+        args = self.swarm.args
+        period = 1.0 / args.input_hz
+        await asyncio.sleep(self.rng.uniform(0, period))  # 전송 시점 분산
+        start = next_at = time.perf_counter()
+        while True:
+            # sleep(period) 를 반복하면 오차가 쌓여서 목표 빈도보다 덜 보내므로 절대 시각 기준으로 예약
+            next_at += period
+            now = time.perf_counter()
+            if next_at < now - period:  # 루프가 밀렸으면 몰아서 보내지 않고 다시 맞춤
+                next_at = now
+            await asyncio.sleep(next_at - now)
+            if not self.swarm.game_running or not self.alive:
+                continue
+            angle, mouse_down = self.brain.next_input(time.perf_counter() - start)
+            # 같은 angle 을 다시 보내면 반영 시점을 구분할 수 없으므로 입력마다 고유하게
+            self.seq += 1
+            angle += self.seq * ANGLE_EPSILON
+            self.emit("playerMove", {"angle": angle, "mouseDown": mouse_down})
+            if self.swarm.measuring:
+                self.swarm.recorder.inputs_sent += 1
+            if self.observer:
+                now = time.perf_counter()
+                if len(self.pending) >= PENDING_MAX:
+                    self.give_up_pending(now, "latency_evicted")
+                self.pending.append((angle, now))
+
+
+# ---------------------------------
+# 스웜 (클라이언트 묶음 + 게임 시작 제어)
+# ---------------------------------
+class Swarm:
+    def __init__(self, args, shard=0, barrier=None):
+        self.args = args
+        self.shard = shard      # --procs 로 나눴을 때 이 프로세스 번호 (0번이 startGame 담당)
+        self.barrier = barrier  # 모든 프로세스의 클라이언트가 레디할 때까지 startGame 을 미룸
+        self.recorder = Recorder()
+        self.clients = []
+        self.leader = None  # startGame 을 보내는 클라이언트 (처음 접속에 성공한 것)
+        self.ready_count = 0
+        self.all_ready = asyncio.Event()
+        self.game_running = False
+        self.measuring = False
+        self.window = (None, None)  # 측정 구간 (시작, 끝) perf_counter
+        self.stopping = False
+        self.started = asyncio.Event()
+        self.aborted = asyncio.Event()  # 측정을 일찍 끝내야 함 (다음 라운드가 시작되지 않음)
+
+    def in_window(self, t):
+        start, end = self.window
+        return start is not None and t >= start and (end is None or t < end)
+
+    def client_ready(self, client):
+        if self.leader is None:
+            self.leader = client
+        self.ready_count += 1
+        self.check_all_ready()
+
+    def check_all_ready(self):
+        if self.ready_count >= len(self.clients) - self.recorder.connect_failed:
+            self.all_ready.set()
+
+    def on_game_start(self, client):
+        if client is self.leader:
+            self.game_running = True
+            self.started.set()
+
+    def on_game_over(self, client):
+        if client is self.leader:
+            self.game_running = False
+            self.started.clear()
+            self.recorder.rounds += 1
+            asyncio.ensure_future(self.restart_round())
+
+    async def wait_for_start(self):
+        # 0번 프로세스가 startGame 을 보내고, 나머지는 gameStart 가 오기만 기다림
+        if self.shard == 0:
+            return await self.start_game()
+        try:
+            await asyncio.wait_for(self.started.wait(), self.args.join_timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.started.is_set()
+
+    async def restart_round(self):
+        if await self.wait_for_start() or self.stopping:
+            return
+        # 게임이 안 도는 서버를 계속 "측정"하지 않도록 측정 구간을 끝냄
+        self.recorder.restart_failed += 1
+        self.log(f"{self.args.join_timeout}s 안에 다음 라운드가 시작되지 않음 → 측정 조기 종료")
+        self.aborted.set()
+
+    async def start_game(self):
+        # 다른 소켓의 setReady가 아직 안 도착했을 수 있으니 gameStart가 올 때까지 재시도.
+        # 실패할 때마다 서버가 전원에게 lobbyUpdate 를 다시 뿌리므로 간격을 점점 늘린다.
+        wait = 2.0
+        deadline = time.monotonic() + self.args.join_timeout
+        while not self.stopping and not self.started.is_set():
+            if time.monotonic() > deadline:
+                return False
+            self.leader.emit("startGame")
+            try:
+                await asyncio.wait_for(self.started.wait(), wait)
+            except asyncio.TimeoutError:
+                wait = min(wait * 2, 16.0)
+        return self.started.is_set()
+
+    async def watch_loop_lag(self):
+        # 이벤트 루프가 밀리면 측정값 자체를 믿을 수 없음
+        interval = 0.05
+        while True:
+            t = time.perf_counter()
+            await asyncio.sleep(interval)
+            if self.measuring:
+                self.recorder.loop_lag_ms.append((time.perf_counter() - t - interval) * 1000.0)
+
+    def log(self, msg, progress=False):
+        # 진행 상황은 0번 프로세스만, 경고는 프로세스 번호를 붙여서 출력
+        if self.args.procs > 1:
+            if progress and self.shard:
+                return
+            msg = f"[{self.shard}] {msg}"
+        print(msg, file=sys.stdout if progress else sys.stderr)
+
+    async def run(self):
+        args = self.args
+        lo = args.clients * self.shard // args.procs
+        hi = args.clients * (self.shard + 1) // args.procs
+        self.clients = [FakeClient(i, self, i < args.observers) for i in range(lo, hi)]
+        ramp = args.ramp / args.procs
+        tasks = []
+        t0 = time.perf_counter()
+        for i, client in enumerate(self.clients):
+            tasks.append(asyncio.ensure_future(client.run()))
+            if ramp > 0:
+                delay = (i + 1) / ramp - (time.perf_counter() - t0)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        self.log(f"클라이언트 {len(self.clients)}/{args.clients}개 접속 시도 ({time.perf_counter() - t0:.1f}s)", progress=True)
+
+        try:
+            await asyncio.wait_for(self.all_ready.wait(), args.join_timeout)
+        except asyncio.TimeoutError:
+            self.log(f"경고: {args.join_timeout}s 안에 {self.ready_count}/{len(self.clients)}개만 레디")
+        if self.ready_count == 0:
+            self.log("접속된 클라이언트가 없음. 서버가 실행 중인지 확인하세요.")
+            if self.barrier:
+                self.barrier.abort()
+            await self.shutdown(tasks)
+            return False
+        if self.barrier:
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, self.barrier.wait, args.join_timeout)
+            except threading.BrokenBarrierError:
+                self.log("다른 프로세스의 클라이언트가 레디하지 못함")
+                await self.shutdown(tasks)
+                return False
+        self.log(f"접속 {self.recorder.connected}/{len(self.clients)}, 실패 {self.recorder.connect_failed}. 게임 시작 요청", progress=True)
+
+        if self.shard == 0 and args.winners is not None:
+            self.leader.emit("setWinnerCount", args.winners)
+        if not await self.wait_for_start():
+            self.log(f"{args.join_timeout}s 안에 게임이 시작되지 않음 (서버가 로비 브로드캐스트를 처리하지 못하는 인원수)")
+            await self.shutdown(tasks)
+            return False
+        try:
+            await asyncio.wait_for(self.aborted.wait(), args.warmup)
+        except asyncio.TimeoutError:
+            pass
+
+        lag = asyncio.ensure_future(self.watch_loop_lag())
+        self.window = (time.perf_counter(), None)
+        self.measuring = True
+        self.log(f"측정 중... ({args.duration}s)", progress=True)
+        try:
+            await asyncio.wait_for(self.aborted.wait(), args.duration)
+        except asyncio.TimeoutError:
+            pass
+        self.measuring = False
+        self.window = (self.window[0], time.perf_counter())
+        lag.cancel()
+        rec = self.recorder
+        rec.measured_s = self.window[1] - self.window[0]
+        rec.input_rate = rec.inputs_sent / rec.measured_s
+        await self.drain()
+
+        await self.shutdown(tasks)
+        return not self.aborted.is_set()
+
+    async def drain(self):
+        # 측정 구간 끝에 보낸 입력은 스냅샷에 반영될 때까지 조금 더 기다림
+        observers = [c for c in self.clients if c.observer]
+        deadline = time.monotonic() + self.args.drain
+        while time.monotonic() < deadline and any(c.has_window_pending() for c in observers):
+            await asyncio.sleep(0.05)
+        now = time.perf_counter()
+        for client in observers:
+            while client.pending:
+                client.give_up_pending(now, "latency_unmatched")
+
+    async def shutdown(self, tasks):
+        self.stopping = True
+        for client in self.clients:
+            if client.ws:
+                client.ws.close()
+        await asyncio.wait(tasks, timeout=5)
+
+
+def report(args, rec):
+    late = [v for v in rec.tick_interval_ms if v > TICK_MS * 1.5]
+    jitter = [abs(v - TICK_MS) for v in rec.tick_interval_ms]
+    print()
+    print(f"=== 결과: 클라이언트 {args.clients} (관측 {min(args.observers, args.clients)}), "
+          f"입력 {args.input_hz:g}Hz, {args.behavior}, {args.duration}s ===")
+    print(f"접속 {rec.connected} / 실패 {rec.connect_failed} / 중간 끊김 {rec.disconnected} / "
+          f"종료된 라운드 {rec.rounds}")
+    if rec.restart_failed:
+        print(f"주의: 다음 라운드 시작 실패 {rec.restart_failed}회 → 측정 조기 종료 "
+              f"(측정 {rec.measured_s:.1f}s / 요청 {args.duration:g}s)")
+    # 로드 제너레이터가 요청한 부하를 실제로 냈는지 (사망/라운드 사이 공백은 목표에서 빼지 않음)
+    target = rec.connected * args.input_hz
+    if target:
+        print(f"입력 전송률 {rec.input_rate:.0f}/s (목표 {target:.0f}/s = {rec.connected} x {args.input_hz:g}Hz, "
+              f"{rec.input_rate / target * 100:.0f}%), 측정 {rec.measured_s:.1f}s 동안 {rec.inputs_sent}개")
+    print(summarize("connect", rec.connect_ms, "ms"))
+    print(summarize("input->snapshot", rec.latency_ms, "ms"))
+    lost = rec.latency_unmatched + rec.latency_evicted
+    if lost or rec.latency_abandoned:
+        print(f"{'':<22} 반영 확인 못 함: drain {args.drain:g}s 초과 {rec.latency_unmatched}, "
+              f"버퍼 초과 {rec.latency_evicted} / 사망·라운드 종료로 버려짐 {rec.latency_abandoned}")
+    if lost:
+        print(summarize("input->snapshot lower", rec.latency_lower_ms, "ms"))
+    print(summarize("snapshot size", [b / 1024.0 for b in rec.snapshot_bytes], "KiB"))
+    print(summarize("tick interval", rec.tick_interval_ms, "ms"))
+    print(summarize("tick jitter", jitter, "ms"))
+    print(summarize("generator loop lag", rec.loop_lag_ms, "ms"))
+    if rec.tick_interval_ms:
+        ratio = len(late) / len(rec.tick_interval_ms)
+        print(f"틱 예산 {TICK_MS:.1f}ms 의 1.5배 초과 간격: {ratio * 100:.1f}%")
+    saturated = bool(rec.loop_lag_ms) and percentile(sorted(rec.loop_lag_ms), 99) > TICK_MS
+    if saturated:
+        print("주의: 로드 제너레이터 이벤트 루프가 밀림 → 지연/지터 값에 클라이언트 쪽 오차가 섞여 있음")
+    if target and rec.input_rate < target * 0.9:
+        if saturated:
+            print(f"주의: 목표 입력량의 90% 미만 전송 → 서버 한계가 아니라 로드 제너레이터 한계 "
+                  f"(--procs 로 나눠서 다시 측정, 현재 {args.procs})")
+        else:
+            print("주의: 목표 입력량의 90% 미만 전송 (루프 지연은 정상 → gameStart 가 늦게 왔거나 관측 클라이언트 사망)")
+
+
+# ---------------------------------
+# 로컬 서버 실행
+# ---------------------------------
+async def port_open(host, port):
+    try:
+        _, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return False
+    writer.close()
+    return True
+
+
+async def wait_for_port(host, port, timeout, server):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline and server.poll() is None:
+        if await port_open(host, port):
+            return True
+        await asyncio.sleep(0.2)
+    return False
+
+
+def spawn_server(port):
+    # server.js 는 PORT 환경변수를 읽는다. stderr 는 실패 원인을 보여주려고 파일에 받아둠
+    log = tempfile.TemporaryFile()
+    env = dict(os.environ, PORT=str(port))
+    server = subprocess.Popen(["node", "server.js"], cwd=SERVER_DIR, env=env,
+                              stdout=subprocess.DEVNULL, stderr=log)
+    return server, log
+
+
+def server_failure(server, log):
+    if server.poll() is None:
+        server.terminate()
+        server.wait()
+        reason = "시간 안에 포트가 열리지 않음"
+    else:
+        reason = f"종료 코드 {server.returncode}"
+    log.seek(0)
+    err = log.read().decode(errors="replace").strip()
+    print(f"server.js 가 시작되지 않았습니다 ({reason})", file=sys.stderr)
+    if err:
+        print(err[-2000:], file=sys.stderr)
+
+
+def raise_fd_limit():
+    # 클라이언트 하나당 소켓 하나 → 기본 ulimit(1024)으로는 부족
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+        except (ValueError, OSError):
+            pass
+
+
+def run_shard(args, shard, barrier, results):
+    raise_fd_limit()
+    swarm = Swarm(args, shard, barrier)
+    try:
+        ok = asyncio.run(swarm.run())
+    except KeyboardInterrupt:
+        return
+    results.put((ok, vars(swarm.recorder)))
+
+
+def run_shards(args):
+    # 이벤트 루프 하나는 수백 클라이언트에서 포화되므로 클라이언트를 여러 프로세스로 나눈다
+    ctx = multiprocessing.get_context("spawn")
+    barrier = ctx.Barrier(args.procs)
+    results = ctx.Queue()
+    workers = [ctx.Process(target=run_shard, args=(args, k, barrier, results), daemon=True)
+               for k in range(args.procs)]
+    for w in workers:
+        w.start()
+    ok, rec, got, idle = True, Recorder(), 0, 0
+    while got < args.procs and idle < 3:
+        try:
+            shard_ok, shard_rec = results.get(timeout=1.0)
+        except queue.Empty:
+            # 전부 끝났는데 결과가 안 오면 몇 번 더 기다렸다가 포기
+            if not any(w.is_alive() for w in workers):
+                idle += 1
+            continue
+        got += 1
+        ok = ok and shard_ok
+        rec.merge(shard_rec)
+    for w in workers:
+        w.join()
+    if got < args.procs:
+        print(f"{args.procs - got}개 프로세스가 결과 없이 종료됨", file=sys.stderr)
+        ok = False
+    return ok, rec
+
+
+async def main_async(args):
+    server = None
+    if args.spawn_server:
+        # 이미 다른 서버가 떠 있으면 그쪽에 붙어버리므로 먼저 확인
+        if await port_open(args.host, args.port):
+            print(f"포트 {args.port} 를 이미 다른 프로세스가 쓰고 있습니다. --spawn-server 없이 실행하거나 "
+                  "--port 를 바꾸세요.", file=sys.stderr)
+            return 1
+        server, log = spawn_server(args.port)
+        if not await wait_for_port(args.host, args.port, 10, server) or server.poll() is not None:
+            server_failure(server, log)
+            return 1
+    try:
+        if args.procs == 1:
+            swarm = Swarm(args)
+            ok = await swarm.run()
+            rec = swarm.recorder
+        else:
+            ok, rec = await asyncio.get_running_loop().run_in_executor(None, run_shards, args)
+        report(args, rec)
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+            log.close()
+    return 0 if ok else 1
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="server.js 부하 테스트 (가짜 클라이언트 스웜)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--clients", type=int, default=100, help="가짜 클라이언트 수")
+    parser.add_argument("--ramp", type=float, default=200.0, help="초당 접속 수 (0이면 한 번에)")
+    parser.add_argument("--duration", type=float, default=20.0, help="측정 시간(초)")
+    parser.add_argument("--warmup", type=float, default=2.0, help="게임 시작 후 측정 전 대기(초)")
+    parser.add_argument("--drain", type=float, default=5.0,
+                        help="측정 종료 후 이미 보낸 입력의 반영을 기다리는 최대 시간(초)")
+    parser.add_argument("--input-hz", type=float, default=60.0, help="클라이언트당 playerMove 전송 빈도")
+    parser.add_argument("--behavior", choices=sorted(BRAINS), default="ai")
+    parser.add_argument("--observers", type=int, default=10,
+                        help="gameState를 파싱해서 측정하는 클라이언트 수 (나머지는 수신만)")
+    parser.add_argument("--winners", type=int, default=None, help="setWinnerCount 로 보낼 승자 수")
+    parser.add_argument("--join-timeout", type=float, default=60.0, help="접속, 레디, 게임 시작 각각의 대기 한도(초)")
+    parser.add_argument("--procs", type=int, default=1,
+                        help="클라이언트를 나눠 돌릴 프로세스 수 (한 프로세스는 수백 명에서 포화)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--spawn-server", action="store_true",
+                        help="node server.js 를 --port 로 직접 띄우고 끝나면 종료")
+    args = parser.parse_args(argv)
+    if args.clients < 1 or args.input_hz <= 0:
+        parser.error("--clients 는 1 이상, --input-hz 는 0보다 커야 합니다")
+    if not 1 <= args.procs <= args.clients:
+        parser.error("--procs 는 1 이상, --clients 이하여야 합니다")
+    return args
+
+
+def main():
+    args = parse_args()
+    raise_fd_limit()
+    try:
+        sys.exit(asyncio.run(main_async(args)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
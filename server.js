@@ -646,7 +646,7 @@ function checkGameOver() {
   }
 }
 
-var PORT = 3000;
+var PORT = process.env.PORT || 3000;
 server.listen(PORT, function() {
   console.log("서버 실행 중: http://localhost:" + PORT);
 });